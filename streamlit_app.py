@@ -1,12 +1,17 @@
 import streamlit as st
 import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from dataclasses import dataclass, field
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from io import BytesIO
+from pathlib import Path
 import random
 import json
-import time
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; evaluation falls back to np.polyval
+    njit = None
 
 # Configure the page
 st.set_page_config(
@@ -17,118 +22,173 @@ st.set_page_config(
 )
 
 # Custom CSS for ocean theme
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #1e40af, #0369a1);
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        color: white;
-        text-align: center;
-    }
-    .score-card {
-        background: linear-gradient(135deg, #0891b2, #0e7490);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        color: white;
-        text-align: center;
-    }
-    .function-card {
-        background: linear-gradient(135deg, #f97316, #ea580c);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        color: white;
-        border: 2px solid #fed7aa;
-    }
-    .level-badge {
-        background: #059669;
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: bold;
-    }
-    .stButton > button {
-        background: linear-gradient(135deg, #0891b2, #0e7490);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 0.5rem 1rem;
-        font-weight: bold;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """Read the theme stylesheet once per server process"""
+    return (Path(__file__).parent / "style.css").read_text(encoding="utf-8")
+
+# Elements not re-emitted on a rerun are cleared, so the style is injected every run
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+def _eval_rational_kernel(num, den, x, out):
+    """Horner-evaluate numerator and denominator and divide in a single pass"""
+    for i in range(x.shape[0]):
+        xi = x[i]
+        n = num[0]
+        for k in range(1, num.shape[0]):
+            n = n * xi + num[k]
+        d = den[0]
+        for k in range(1, den.shape[0]):
+            d = d * xi + den[k]
+        out[i] = n / d if abs(d) > 1e-10 else np.nan
+
+_eval_rational = njit(cache=True)(_eval_rational_kernel) if njit else None
+
+def evaluate_rational(num_coeffs, den_coeffs, x):
+    """Evaluate numerator/denominator coefficients at x (scalar or array)"""
+    x = np.asarray(x, dtype=np.float64)
+    is_scalar = x.ndim == 0
+    x = np.atleast_1d(x)
+    
+    if _eval_rational is not None:
+        num_coeffs = np.ascontiguousarray(num_coeffs, dtype=np.float64)
+        den_coeffs = np.ascontiguousarray(den_coeffs, dtype=np.float64)
+        flat_x = np.ascontiguousarray(x.ravel())
+        out = np.empty_like(flat_x)
+        _eval_rational(num_coeffs, den_coeffs, flat_x, out)
+        y = out.reshape(x.shape)
+    else:
+        num_val = np.polyval(num_coeffs, x)
+        den_val = np.polyval(den_coeffs, x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = np.where(np.abs(den_val) < 1e-10, np.nan, num_val / den_val)
+    
+    # NaN near poles and for huge values so the plotted line breaks at asymptotes
+    y = np.where(np.abs(y) > 100, np.nan, y)
+    return y.item() if is_scalar else y
+
+def batch_real_roots(coeff_lists):
+    """Sorted real roots of many polynomials using one stacked eigvals call"""
+    polys = [np.trim_zeros(np.asarray(c, dtype=np.float64), 'f') for c in coeff_lists]
+    degrees = [max(len(p) - 1, 0) for p in polys]
+    size = max(degrees, default=0)
+    if size == 0:
+        return [[] for _ in polys]
+    
+    # Companion matrices padded to a common size; the zero padding block
+    # contributes exactly size - degree spurious roots at 0
+    companions = np.zeros((len(polys), size, size))
+    for row, (p, degree) in enumerate(zip(polys, degrees)):
+        if degree:
+            companions[row, 0, :degree] = -p[1:] / p[0]
+            companions[row, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+    
+    result = []
+    for roots, degree in zip(np.linalg.eigvals(companions), degrees):
+        roots = roots[np.argsort(np.abs(roots), kind='stable')][size - degree:]
+        real = roots[np.abs(roots.imag) < 1e-9].real
+        # Round off companion-matrix noise (and -0.0) so values display cleanly
+        result.append(sorted((np.round(real, 10) + 0.0).tolist()))
+    return result
+
+def real_roots(coeffs):
+    """Sorted real roots of a polynomial of any degree"""
+    return batch_real_roots([coeffs])[0]
+
+def _fmt(c):
+    """Format a coefficient, dropping the decimal point for whole numbers"""
+    ic = int(c)
+    return str(ic) if ic == c else str(c)
 
 # Game Data Classes
+@dataclass(frozen=True, slots=True)
 class RationalFunction:
-    def __init__(self, numerator, denominator, level, name):
-        self.numerator = numerator  # list of coefficients
-        self.denominator = denominator  # list of coefficients
-        self.level = level
-        self.name = name
-        self.vertical_asymptotes = self.find_vertical_asymptotes()
-        self.horizontal_asymptote = self.find_horizontal_asymptote()
-        self.x_intercepts = self.find_x_intercepts()
-        self.y_intercept = self.find_y_intercept()
-        
-    def find_vertical_asymptotes(self):
-        # Find roots of denominator (simplified)
-        if len(self.denominator) == 2:  # Linear: ax + b
-            if self.denominator[0] != 0:
-                return [-self.denominator[1] / self.denominator[0]]
-        elif len(self.denominator) == 3:  # Quadratic: ax² + bx + c
-            a, b, c = self.denominator
-            if a != 0:
-                discriminant = b**2 - 4*a*c
-                if discriminant >= 0:
-                    sqrt_disc = discriminant**0.5
-                    return [(-b + sqrt_disc)/(2*a), (-b - sqrt_disc)/(2*a)]
-        return []
-    
-    def find_horizontal_asymptote(self):
-        num_degree = len(self.numerator) - 1
-        den_degree = len(self.denominator) - 1
+    numerator: tuple  # coefficients, highest degree first
+    denominator: tuple  # coefficients, highest degree first
+    level: int
+    name: str
+    vertical_asymptotes: tuple
+    horizontal_asymptote: float | None
+    x_intercepts: tuple
+    y_intercept: float | None
+    _num_coeffs: np.ndarray = field(init=False, repr=False, compare=False)
+    _den_coeffs: np.ndarray = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_num_coeffs', np.ascontiguousarray(self.numerator, dtype=np.float64))
+        object.__setattr__(self, '_den_coeffs', np.ascontiguousarray(self.denominator, dtype=np.float64))
+    
+    @classmethod
+    def from_coefficients(cls, numerator, denominator, level, name):
+        """Build a function, finding its asymptotes and intercepts at runtime"""
+        return cls(
+            tuple(numerator), tuple(denominator), level, name,
+            vertical_asymptotes=tuple(cls.find_vertical_asymptotes(denominator)),
+            horizontal_asymptote=cls.find_horizontal_asymptote(numerator, denominator),
+            x_intercepts=tuple(cls.find_x_intercepts(numerator)),
+            y_intercept=cls.find_y_intercept(numerator, denominator)
+        )
+    
+    @classmethod
+    def from_coefficients_batch(cls, specs):
+        """Build many functions from (numerator, denominator, level, name) specs,
+        finding every function's roots in a single batched solve"""
+        specs = list(specs)
+        roots = batch_real_roots(
+            [numerator for numerator, _, _, _ in specs] +
+            [denominator for _, denominator, _, _ in specs]
+        )
+        x_roots, va_roots = roots[:len(specs)], roots[len(specs):]
+        return [
+            cls(
+                tuple(numerator), tuple(denominator), level, name,
+                vertical_asymptotes=tuple(vas),
+                horizontal_asymptote=cls.find_horizontal_asymptote(numerator, denominator),
+                x_intercepts=tuple(xis),
+                y_intercept=cls.find_y_intercept(numerator, denominator)
+            )
+            for (numerator, denominator, level, name), xis, vas in zip(specs, x_roots, va_roots)
+        ]
+    
+    @staticmethod
+    def find_vertical_asymptotes(denominator):
+        # Real roots of denominator
+        return real_roots(denominator)
+    
+    @staticmethod
+    def find_horizontal_asymptote(numerator, denominator):
+        num_degree = len(numerator) - 1
+        den_degree = len(denominator) - 1
         
         if num_degree < den_degree:
             return 0
         elif num_degree == den_degree:
-            return self.numerator[0] / self.denominator[0]
+            return numerator[0] / denominator[0]
         else:
             return None  # No horizontal asymptote
     
-    def find_x_intercepts(self):
-        # Find roots of numerator (simplified)
-        if len(self.numerator) == 2:  # Linear
-            if self.numerator[0] != 0:
-                return [-self.numerator[1] / self.numerator[0]]
-        return []
+    @staticmethod
+    def find_x_intercepts(numerator):
+        # Real roots of numerator
+        return real_roots(numerator)
     
-    def find_y_intercept(self):
+    @staticmethod
+    def find_y_intercept(numerator, denominator):
         # f(0) if defined
-        if self.denominator[-1] != 0:
-            return self.numerator[-1] / self.denominator[-1]
+        if denominator[-1] != 0:
+            return numerator[-1] / denominator[-1]
         return None
     
     def evaluate(self, x):
-        """Evaluate the rational function at x"""
-        if isinstance(x, (list, np.ndarray)):
-            return [self.evaluate(xi) for xi in x]
-        
-        num_val = sum(coef * (x ** (len(self.numerator) - 1 - i)) for i, coef in enumerate(self.numerator))
-        den_val = sum(coef * (x ** (len(self.denominator) - 1 - i)) for i, coef in enumerate(self.denominator))
-        
-        if abs(den_val) < 1e-10:
-            return np.inf if den_val > 0 else -np.inf
-        return num_val / den_val
+        """Evaluate the rational function at x (scalar or array)"""
+        return evaluate_rational(self._num_coeffs, self._den_coeffs, x)
     
     def format_polynomial(self, coeffs):
         """Format polynomial coefficients as a string"""
         if not coeffs:
             return "0"
         
-        terms = []
+        parts = []
         degree = len(coeffs) - 1
         
         for i, coef in enumerate(coeffs):
@@ -136,82 +196,71 @@ class RationalFunction:
                 continue
                 
             power = degree - i
+            magnitude = abs(coef)
             
             if power == 0:
-                terms.append(str(int(coef)) if coef == int(coef) else str(coef))
-            elif power == 1:
-                if coef == 1:
-                    terms.append("x")
-                elif coef == -1:
-                    terms.append("-x")
-                else:
-                    terms.append(f"{int(coef) if coef == int(coef) else coef}x")
-            else:
-                if coef == 1:
-                    terms.append(f"x^{power}")
-                elif coef == -1:
-                    terms.append(f"-x^{power}")
-                else:
-                    terms.append(f"{int(coef) if coef == int(coef) else coef}x^{power}")
-        
-        if not terms:
-            return "0"
-        
-        result = terms[0]
-        for term in terms[1:]:
-            if term.startswith('-'):
-                result += f" - {term[1:]}"
+                term = _fmt(magnitude)
             else:
-                result += f" + {term}"
+                var = "x" if power == 1 else f"x^{power}"
+                term = var if magnitude == 1 else f"{_fmt(magnitude)}{var}"
+            
+            # Signs are emitted as separate tokens so the string is joined once
+            if parts:
+                parts.append(" - " if coef < 0 else " + ")
+            elif coef < 0:
+                parts.append("-")
+            parts.append(term)
         
-        return result
+        return "".join(parts) if parts else "0"
     
     def get_equation(self):
         num_str = self.format_polynomial(self.numerator)
         den_str = self.format_polynomial(self.denominator)
         return f"({num_str}) / ({den_str})"
 
+@dataclass(frozen=True, slots=True)
 class Question:
-    def __init__(self, function, q_type, question_text, options, correct_answer, explanation, points):
-        self.function = function
-        self.type = q_type
-        self.question_text = question_text
-        self.options = options
-        self.correct_answer = correct_answer
-        self.explanation = explanation
-        self.points = points
-
-# Initialize session state
-if 'game_state' not in st.session_state:
-    st.session_state.game_state = {
-        'player_name': '',
-        'current_level': 1,
-        'score': 0,
-        'lives': 5,
-        'functions_caught': [],
-        'current_function': None,
-        'current_questions': [],
-        'question_index': 0,
-        'game_started': False,
-        'show_feedback': False,
-        'feedback_data': {},
-        'leaderboard': []
-    }
+    function: RationalFunction
+    type: str
+    question_text: str
+    options: tuple
+    correct_answer: str
+    explanation: str
+    points: int
 
 # Game Functions
+@st.cache_resource
 def create_sample_functions():
-    """Create sample rational functions for different levels"""
+    """Create sample rational functions for different levels
+    
+    Built once and shared across sessions and reruns, so the returned
+    functions must be treated as read-only.
+    """
     functions = {
         1: [
-            RationalFunction([1], [1, 0], 1, "f(x) = 1/x"),
-            RationalFunction([2], [1, -1], 1, "f(x) = 2/(x-1)"),
-            RationalFunction([1, 0], [1, -2], 1, "f(x) = x/(x-2)"),
-            RationalFunction([3], [1, 1], 1, "f(x) = 3/(x+1)")
+            RationalFunction((1,), (1, 0), 1, "f(x) = 1/x",
+                             vertical_asymptotes=(0.0,), horizontal_asymptote=0,
+                             x_intercepts=(), y_intercept=None),
+            RationalFunction((2,), (1, -1), 1, "f(x) = 2/(x-1)",
+                             vertical_asymptotes=(1.0,), horizontal_asymptote=0,
+                             x_intercepts=(), y_intercept=-2.0),
+            RationalFunction((1, 0), (1, -2), 1, "f(x) = x/(x-2)",
+                             vertical_asymptotes=(2.0,), horizontal_asymptote=1.0,
+                             x_intercepts=(0.0,), y_intercept=0.0),
+            RationalFunction((3,), (1, 1), 1, "f(x) = 3/(x+1)",
+                             vertical_asymptotes=(-1.0,), horizontal_asymptote=0,
+                             x_intercepts=(), y_intercept=3.0)
         ],
         2: [
-            RationalFunction([2, 0], [1, -1], 2, "f(x) = 2x/(x-1)"),
-            RationalFunction([1, -1], [1, 0, -4], 2, "f(x) = (x-1)/(x²-4)"),
-            RationalFunction([1, 0, 1], [1, 0], 2, "f(x) = (x²+1)/x")
+            RationalFunction((2, 0), (1, -1), 2, "f(x) = 2x/(x-1)",
+                             vertical_asymptotes=(1.0,), horizontal_asymptote=2.0,
+                             x_intercepts=(0.0,), y_intercept=0.0),
+            RationalFunction((1, -1), (1, 0, -4), 2, "f(x) = (x-1)/(x²-4)",
+                             vertical_asymptotes=(-2.0, 2.0), horizontal_asymptote=0,
+                             x_intercepts=(1.0,), y_intercept=0.25),
+            RationalFunction((1, 0, 1), (1, 0), 2, "f(x) = (x²+1)/x",
+                             vertical_asymptotes=(0.0,), horizontal_asymptote=None,
+                             x_intercepts=(), y_intercept=None)
         ]
     }
     return functions
@@ -227,7 +276,7 @@ def create_questions(function):
             questions.append(Question(
                 function, "vertical_asymptote",
                 f"What is the vertical asymptote of {function.name}?",
-                [f"x = {va}", f"x = {va+1}", f"y = {va}", "No vertical asymptote"],
+                (f"x = {va}", f"x = {va+1}", f"y = {va}", "No vertical asymptote"),
                 f"x = {va}",
                 f"The vertical asymptote occurs where the denominator equals zero.",
                 100
@@ -237,7 +286,7 @@ def create_questions(function):
             questions.append(Question(
                 function, "vertical_asymptote",
                 f"What are the vertical asymptotes of {function.name}?",
-                [f"x = {va1} and x = {va2}", f"x = {va1}", f"x = {va2}", "No vertical asymptotes"],
+                (f"x = {va1} and x = {va2}", f"x = {va1}", f"x = {va2}", "No vertical asymptotes"),
                 f"x = {va1} and x = {va2}",
                 f"The vertical asymptotes occur where the denominator equals zero.",
                 150
@@ -249,7 +298,7 @@ def create_questions(function):
         questions.append(Question(
             function, "horizontal_asymptote",
             f"What is the horizontal asymptote of {function.name}?",
-            [f"y = {ha}", f"y = {ha+1}", f"y = 0", "No horizontal asymptote"],
+            (f"y = {ha}", f"y = {ha+1}", f"y = 0", "No horizontal asymptote"),
             f"y = {ha}",
             f"Compare the degrees of numerator and denominator to find the horizontal asymptote.",
             100
@@ -261,96 +310,130 @@ def create_questions(function):
         questions.append(Question(
             function, "x_intercept",
             f"What is the x-intercept of {function.name}?",
-            [f"x = {xi}", f"x = {xi+1}", f"x = 0", "No x-intercept"],
+            (f"x = {xi}", f"x = {xi+1}", f"x = 0", "No x-intercept"),
             f"x = {xi}",
             f"X-intercepts occur where the numerator equals zero.",
             100
         ))
     
-    return questions
+    return tuple(questions)
+
+@st.cache_resource
+def questions_by_function_name():
+    """Pre-generate the questions for every sample function, keyed by name"""
+    return {
+        function.name: create_questions(function)
+        for functions in create_sample_functions().values()
+        for function in functions
+    }
+
+@st.cache_resource
+def functions_by_name():
+    """Look up sample functions by name"""
+    return {
+        function.name: function
+        for functions in create_sample_functions().values()
+        for function in functions
+    }
+
+def available_names_by_level():
+    """Fresh per-level availability; dict keys act as an insertion-ordered set"""
+    return {
+        level: dict.fromkeys(function.name for function in functions)
+        for level, functions in create_sample_functions().items()
+    }
+
+# Initialize session state
+if 'game_state' not in st.session_state:
+    st.session_state.game_state = {
+        'player_name': '',
+        'current_level': 1,
+        'score': 0,
+        'lives': 5,
+        'functions_caught': set(),
+        'available_by_level': available_names_by_level(),
+        'current_function': None,
+        'current_questions': [],
+        'question_index': 0,
+        'game_started': False,
+        'show_feedback': False,
+        'feedback_data': {},
+        'leaderboard': []
+    }
 
 def plot_rational_function(function):
-    """Create a plot of the rational function"""
+    """Create a PNG plot of the rational function"""
     if not function:
         return None
     
-    # Generate x values, avoiding vertical asymptotes
-    x_vals = []
-    y_vals = []
-    
-    # Create multiple segments to handle asymptotes
-    x_ranges = [(-10, -5), (-4.9, -0.1), (0.1, 4.9), (5, 10)]
-    
-    for x_start, x_end in x_ranges:
-        x_segment = np.linspace(x_start, x_end, 100)
-        y_segment = []
-        
-        for x in x_segment:
-            try:
-                y = function.evaluate(x)
-                if abs(y) < 100:  # Limit y values for better visualization
-                    y_segment.append(y)
-                else:
-                    y_segment.append(None)
-            except:
-                y_segment.append(None)
-        
-        x_vals.extend(x_segment)
-        y_vals.extend(y_segment)
-    
-    # Create the plot
-    fig = go.Figure()
+    return _build_plot(
+        tuple(function.numerator),
+        tuple(function.denominator),
+        tuple(function.vertical_asymptotes),
+        function.horizontal_asymptote,
+        tuple(function.x_intercepts),
+        function.y_intercept,
+        function.name
+    )
+
+@st.cache_data(max_entries=64)
+def _build_plot(num_coeffs, den_coeffs, vertical_asymptotes, horizontal_asymptote,
+                x_intercepts, y_intercept, name):
+    """Render the rational function graph to PNG bytes (cached per function)"""
+    # Evaluate on one grid; NaN entries become gaps in the line
+    x_vals = np.linspace(-10, 10, 2000)
+    y_vals = evaluate_rational(num_coeffs, den_coeffs, x_vals)
+    
+    # Break the curve around each vertical asymptote
+    for va in vertical_asymptotes:
+        y_vals[np.abs(x_vals - va) < 0.05] = np.nan
+    y_vals[np.abs(y_vals) > 100] = np.nan
+    
+    # Create the plot (Agg canvas, no pyplot global state)
+    fig = Figure(figsize=(7, 5), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     
     # Add the function curve
-    fig.add_trace(go.Scatter(
-        x=x_vals, y=y_vals,
-        mode='lines',
-        name=function.name,
-        line=dict(color='#0891b2', width=3)
-    ))
+    ax.plot(x_vals, y_vals, color='#0891b2', linewidth=3, label=name)
     
     # Add vertical asymptotes
-    for va in function.vertical_asymptotes:
+    for va in vertical_asymptotes:
         if -10 <= va <= 10:
-            fig.add_vline(x=va, line_dash="dash", line_color="red", 
-                         annotation_text=f"x = {va}")
+            ax.axvline(va, linestyle='--', color='red')
+            ax.text(va, 9.5, f" x = {va}", color='red', va='top')
     
     # Add horizontal asymptote
-    if function.horizontal_asymptote is not None:
-        fig.add_hline(y=function.horizontal_asymptote, line_dash="dash", 
-                     line_color="green", 
-                     annotation_text=f"y = {function.horizontal_asymptote}")
-    
-    # Add intercepts
-    if function.y_intercept is not None and abs(function.y_intercept) < 100:
-        fig.add_trace(go.Scatter(
-            x=[0], y=[function.y_intercept],
-            mode='markers',
-            name='Y-intercept',
-            marker=dict(color='blue', size=8)
-        ))
-    
-    for xi in function.x_intercepts:
+    if horizontal_asymptote is not None:
+        ax.axhline(horizontal_asymptote, linestyle='--', color='green')
+        ax.text(9.5, horizontal_asymptote, f"y = {horizontal_asymptote}",
+                color='green', ha='right', va='bottom')
+    
+    # Add intercepts as one marker collection (y-intercept blue, x-intercepts orange)
+    ix, iy, colors = [], [], []
+    if y_intercept is not None and abs(y_intercept) < 100:
+        ix.append(0)
+        iy.append(y_intercept)
+        colors.append('blue')
+    for xi in x_intercepts:
         if -10 <= xi <= 10:
-            fig.add_trace(go.Scatter(
-                x=[xi], y=[0],
-                mode='markers',
-                name='X-intercept',
-                marker=dict(color='orange', size=8)
-            ))
-    
-    fig.update_layout(
-        title=f"Graph of {function.name}",
-        xaxis_title="x",
-        yaxis_title="y",
-        xaxis=dict(range=[-10, 10], gridcolor='lightgray'),
-        yaxis=dict(range=[-10, 10], gridcolor='lightgray'),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        showlegend=True
-    )
-    
-    return fig
+            ix.append(xi)
+            iy.append(0)
+            colors.append('orange')
+    if ix:
+        ax.scatter(ix, iy, c=colors, s=64, zorder=3, label='Intercepts')
+    
+    ax.set_title(f"Graph of {name}")
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_xlim(-10, 10)
+    ax.set_ylim(-10, 10)
+    ax.grid(color='lightgray')
+    ax.legend(loc='lower left')
+    
+    buf = BytesIO()
+    canvas.print_png(buf)
+    return buf.getvalue()
 
 # Main App Layout
 def main():
@@ -397,8 +480,7 @@ def main():
             if st.button("🏆 View Leaderboard"):
                 show_leaderboard()
             
-            if st.button("🔄 New Game"):
-                reset_game()
+            st.button("🔄 New Game", on_click=reset_game)
     
     if not st.session_state.game_state['game_started']:
         st.markdown("""
@@ -424,14 +506,13 @@ def main():
         st.markdown("### 🎣 Fishing Area - Choose a Function to Catch")
         
         # Get available functions for current level
-        all_functions = create_sample_functions()
-        available_functions = [f for f in all_functions.get(st.session_state.game_state['current_level'], []) 
-                             if f.name not in st.session_state.game_state['functions_caught']]
+        available_names = st.session_state.game_state['available_by_level'].get(
+            st.session_state.game_state['current_level'], {})
+        available_functions = [functions_by_name()[name] for name in available_names]
         
         if not available_functions:
             st.success("🎉 Level Complete! All functions caught!")
-            if st.button("Advance to Next Level"):
-                advance_level()
+            st.button("Advance to Next Level", on_click=advance_level)
         else:
             for i, function in enumerate(available_functions):
                 st.markdown(f"""
@@ -441,8 +522,8 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                if st.button(f"Catch {function.name}", key=f"catch_{i}"):
-                    catch_function(function)
+                st.button(f"Catch {function.name}", key=f"catch_{i}",
+                          on_click=catch_function, args=(function,))
     
     with col2:
         st.markdown("### 📊 Function Analysis")
@@ -453,9 +534,9 @@ def main():
             st.markdown(f"**Current Function:** {function.name}")
             
             # Plot the function
-            fig = plot_rational_function(function)
-            if fig:
-                st.plotly_chart(fig, use_container_width=True)
+            png = plot_rational_function(function)
+            if png:
+                st.image(png, use_container_width=True)
             
             # Show function properties
             st.markdown("**Function Properties:**")
@@ -488,54 +569,74 @@ def main():
             st.markdown(f"**Question {q_index + 1} of {len(questions)}:**")
             st.markdown(f"**{question.question_text}**")
             
+            if st.session_state.game_state['show_feedback']:
+                show_answer_feedback()
+                return
+            
             # Multiple choice options
-            answer = st.radio("Choose your answer:", question.options, key=f"q_{q_index}")
+            answer_key = f"q_{q_index}"
+            st.radio("Choose your answer:", question.options, key=answer_key)
             
             col1, col2, col3 = st.columns([1, 1, 1])
             with col1:
-                if st.button("Submit Answer"):
-                    submit_answer(question, answer)
+                st.button("Submit Answer", on_click=submit_answer, args=(question, answer_key))
             with col2:
+                # Renders inline and mutates no state, so it stays a plain button
                 if st.button("Get Hint"):
                     show_hint(question)
             with col3:
-                if st.button("Skip Question"):
-                    next_question()
+                st.button("Skip Question", on_click=next_question)
 
 def catch_function(function):
-    """Handle catching a function"""
+    """Handle catching a function (button callback)"""
     st.session_state.game_state['current_function'] = function
-    st.session_state.game_state['current_questions'] = create_questions(function)
+    st.session_state.game_state['current_questions'] = questions_by_function_name()[function.name]
     st.session_state.game_state['question_index'] = 0
-    st.session_state.game_state['functions_caught'].append(function.name)
+    st.session_state.game_state['show_feedback'] = False
+    st.session_state.game_state['functions_caught'].add(function.name)
+    st.session_state.game_state['available_by_level'][function.level].pop(function.name, None)
     
     st.success(f"🎣 Caught {function.name}! Answer questions to earn points.")
-    st.rerun()
 
-def submit_answer(question, answer):
-    """Handle answer submission"""
-    is_correct = answer == question.correct_answer
+def submit_answer(question, answer_key):
+    """Handle answer submission (button callback)"""
+    is_correct = st.session_state[answer_key] == question.correct_answer
     points = question.points if is_correct else 0
     
     if is_correct:
         st.session_state.game_state['score'] += points
-        st.success(f"✅ Correct! +{points} points")
-        st.info(f"**Explanation:** {question.explanation}")
     else:
         st.session_state.game_state['lives'] -= 1
-        st.error(f"❌ Incorrect. The correct answer was: {question.correct_answer}")
-        st.info(f"**Explanation:** {question.explanation}")
+    
+    # Feedback is rendered on the next run; the player advances when ready
+    st.session_state.game_state['feedback_data'] = {
+        'is_correct': is_correct,
+        'points': points,
+        'correct_answer': question.correct_answer,
+        'explanation': question.explanation
+    }
+    st.session_state.game_state['show_feedback'] = True
+
+def show_answer_feedback():
+    """Display feedback for the last submitted answer"""
+    feedback = st.session_state.game_state['feedback_data']
+    
+    if feedback['is_correct']:
+        st.success(f"✅ Correct! +{feedback['points']} points")
+    else:
+        st.error(f"❌ Incorrect. The correct answer was: {feedback['correct_answer']}")
+    st.info(f"**Explanation:** {feedback['explanation']}")
     
     if st.session_state.game_state['lives'] <= 0:
         st.error("💀 Game Over! You ran out of lives.")
         return
     
-    # Auto-advance to next question after a short delay
-    time.sleep(2)
-    next_question()
+    st.button("Next Question", on_click=next_question)
 
 def next_question():
-    """Move to the next question"""
+    """Move to the next question (button callback)"""
+    st.session_state.game_state['show_feedback'] = False
+    st.session_state.game_state['feedback_data'] = {}
     st.session_state.game_state['question_index'] += 1
     
     if (st.session_state.game_state['question_index'] >= 
@@ -545,8 +646,6 @@ def next_question():
         st.session_state.game_state['current_questions'] = []
         st.session_state.game_state['question_index'] = 0
         st.success("🌟 Function complete! Catch another function to continue.")
-    
-    st.rerun()
 
 def show_hint(question):
     """Show a hint for the current question"""
@@ -561,40 +660,34 @@ def show_hint(question):
     st.info(f"💡 **Hint:** {hint}")
 
 def advance_level():
-    """Advance to the next level"""
+    """Advance to the next level (button callback)"""
     st.session_state.game_state['current_level'] += 1
-    st.session_state.game_state['functions_caught'] = []
+    st.session_state.game_state['functions_caught'] = set()
     st.session_state.game_state['current_function'] = None
     st.session_state.game_state['current_questions'] = []
     st.success(f"🎉 Welcome to Level {st.session_state.game_state['current_level']}!")
-    st.rerun()
 
 def show_leaderboard():
     """Display the leaderboard"""
     st.markdown("### 🏆 Leaderboard")
     
-    # Add current player to leaderboard
-    player_data = {
-        'name': st.session_state.game_state['player_name'],
-        'score': st.session_state.game_state['score'],
-        'level': st.session_state.game_state['current_level']
-    }
-    
-    # Simple leaderboard (in real app, this would be persistent)
-    leaderboard = [player_data]
-    df = pd.DataFrame(leaderboard)
-    df = df.sort_values('score', ascending=False)
-    
-    st.dataframe(df, use_container_width=True)
+    # Simple single-player leaderboard (in real app, this would be persistent
+    # and kept sorted as scores are added rather than re-sorted per view)
+    st.table({
+        'name': [st.session_state.game_state['player_name']],
+        'score': [st.session_state.game_state['score']],
+        'level': [st.session_state.game_state['current_level']]
+    })
 
 def reset_game():
-    """Reset the game"""
+    """Reset the game (button callback)"""
     st.session_state.game_state = {
         'player_name': '',
         'current_level': 1,
         'score': 0,
         'lives': 5,
-        'functions_caught': [],
+        'functions_caught': set(),
+        'available_by_level': available_names_by_level(),
         'current_function': None,
         'current_questions': [],
         'question_index': 0,
@@ -603,7 +696,6 @@ def reset_game():
         'feedback_data': {},
         'leaderboard': []
     }
-    st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file